@@ -1,42 +1,100 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, simpledialog
-import subprocess, sys, os, json, time, signal
+from tkinter import ttk
+# filedialog/messagebox/simpledialog are imported lazily in the handlers
+# that need them: they drag in extra Tk machinery that a CLI-style
+# "import service_aggregator" caller never touches.
+import subprocess, sys, os, json, time, signal, bisect
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 CONFIG_FILE = Path(__file__).with_name("services_config.json")
 
+# Raw append fd for service logs: no TextIOWrapper buffering to manage,
+# and close-on-exec (where available) keeps it from leaking into children
+# beyond the stdout/stderr dup that Popen sets up explicitly.
+LOG_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+
 class Service:
     def __init__(self, path: str):
         self.path = path
         self.proc: subprocess.Popen | None = None
         self.start_time: float | None = None
         self.last_returncode: int | None = None
-        self.log_path = Path(path).with_suffix(".log")
-        self._log_handle = None
+        # Parse the path once; the derived pieces are hit per-row on every
+        # refresh and re-parsing the string each time adds up.
+        self._path_obj = Path(path)
+        self._parent = self._path_obj.parent
+        self._suffix = self._path_obj.suffix.lower()
+        self.log_path = self._path_obj.with_suffix(".log")
+        self._log_fd: int | None = None
+        self._last_seen_running = False
+        self._missing_until = 0.0
+        self._uptime_cache: tuple[int, str] = (-1, "")
 
     @property
     def is_running(self): return self.proc is not None and self.proc.poll() is None
     @property
     def pid(self): return self.proc.pid if self.is_running else ""
-    @property
-    def mtime(self):
+    def _stat_once(self):
+        # Derive existence and mtime from a single stat syscall instead of
+        # a separate exists() + getmtime() pair per row. Known-missing
+        # paths are re-probed at most every 5 s, so a dangling entry on a
+        # slow share can't stall every refresh.
+        now = time.monotonic()
+        if now < self._missing_until:
+            return False, "N/A"
         try:
-            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(os.path.getmtime(self.path)))
+            st = os.stat(self.path)
+            exists = True
+            mtime_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(st.st_mtime))
+            self._missing_until = 0.0
         except OSError:
-            return "N/A"
+            exists, mtime_str = False, "N/A"
+            self._missing_until = now + 5.0
+        return exists, mtime_str
+
+    def uptime_str(self, now: float):
+        # The formatted string only changes once per second; reuse it
+        # until the whole-second diff actually moves.
+        if not (self.is_running and self.start_time): return ""
+        diff = int(now - self.start_time)
+        if self._uptime_cache[0] != diff:
+            m, sec = divmod(diff, 60); h, m = divmod(m, 60)
+            self._uptime_cache = (diff, f"{h:02d}:{m:02d}:{sec:02d}")
+        return self._uptime_cache[1]
+
+    def _ensure_log_open(self):
+        # Reuse the log fd across restarts; only reopen when it was never
+        # opened or the file was rotated/deleted underneath us.
+        if self._log_fd is not None:
+            try:
+                if os.fstat(self._log_fd).st_ino == os.stat(self.log_path).st_ino:
+                    return
+            except OSError:
+                pass
+            try: os.close(self._log_fd)
+            except OSError: pass
+            self._log_fd = None
+        self._log_fd = os.open(self.log_path, LOG_OPEN_FLAGS, 0o644)
+
+    def close_log(self):
+        if self._log_fd is not None:
+            try: os.close(self._log_fd)
+            except OSError: pass
+            self._log_fd = None
 
     def start(self):
         if self.is_running: return
-        if not Path(self.path).exists(): raise FileNotFoundError(self.path)
-        self._log_handle = open(self.log_path, "a", encoding="utf-8")
-        self._log_handle.write(f"\n=== START {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n"); self._log_handle.flush()
+        self._ensure_log_open()
+        banner = f"\n=== START {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n"
+        os.write(self._log_fd, banner.encode("utf-8"))
         creationflags = subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0
 
         # Decide how to launch the service depending on file type.
         # - .py -> launch with the Python interpreter used to run this program
         # - .exe -> run directly
         # - otherwise -> try running directly
-        ext = Path(self.path).suffix.lower()
+        ext = self._suffix
         if ext == ".py":
             cmd = [sys.executable, self.path]
         elif ext == ".exe":
@@ -49,42 +107,57 @@ class Service:
             # Attempt to run directly (may fail if not executable)
             cmd = [self.path]
 
-        self.proc = subprocess.Popen(
-            cmd,
-            stdout=self._log_handle,
-            stderr=subprocess.STDOUT,
-            creationflags=creationflags,
-            cwd=Path(self.path).parent  # <-- ensure service runs in its own folder
-        )
-        self.start_time = time.time()
+        # No exists() pre-check: Popen stats the target itself and raises
+        # for missing/unreadable paths, so the extra syscall buys nothing.
+        try:
+            self.proc = subprocess.Popen(
+                cmd,
+                stdout=self._log_fd,
+                stderr=subprocess.STDOUT,
+                creationflags=creationflags,
+                cwd=self._parent  # <-- ensure service runs in its own folder
+            )
+        except OSError as e:
+            raise RuntimeError(f"cannot start {self.path}: {e}")
+        # Monotonic: uptime is a duration, and the wall clock can step
+        # backwards under NTP adjustments.
+        self.start_time = time.monotonic()
         self.last_returncode = None
 
-    def stop(self, force=False):
+    def request_stop(self, force=False):
+        # Signal the process to exit without waiting for it; callers that
+        # need the exit reaped use wait/_batch_wait plus _finalize_stop.
         if not self.is_running: return
-        try:
-            if os.name == "nt":
-                if force:
-                    self.proc.kill()
-                else:
-                    try: os.kill(self.proc.pid, signal.CTRL_BREAK_EVENT)
-                    except Exception: pass
-                    self.proc.terminate()
+        if os.name == "nt":
+            if force:
+                self.proc.kill()
             else:
+                try: os.kill(self.proc.pid, signal.CTRL_BREAK_EVENT)
+                except Exception: pass
                 self.proc.terminate()
-                if force:
-                    time.sleep(0.8)
-                    if self.is_running: self.proc.kill()
+        else:
+            self.proc.terminate()
+
+    def _finalize_stop(self):
+        # The log fd is unbuffered and stays open for the next start;
+        # close_log() handles removal and app exit.
+        if self.proc: self.last_returncode = self.proc.returncode
+        self.proc = None; self.start_time = None
+
+    def stop(self, force=False):
+        if not self.is_running: return
+        try:
+            try: self.request_stop(force=force)
+            except Exception: pass
+            if force and os.name != "nt":
+                time.sleep(0.8)
+                if self.is_running: self.proc.kill()
             try: self.proc.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 try: self.proc.kill()
                 except Exception: pass
         finally:
-            if self.proc: self.last_returncode = self.proc.returncode
-            self.proc = None; self.start_time = None
-            if self._log_handle:
-                try: self._log_handle.flush(); self._log_handle.close()
-                except Exception: pass
-                self._log_handle = None
+            self._finalize_stop()
 
     def restart(self):
         self.stop(force=True)
@@ -99,8 +172,14 @@ class ServiceAggregator(tk.Tk):
         self.geometry("1040x520")
         self.configure(bg='#1e1e1e')
         self.services: list[Service] = []
+        self._by_path: dict[str, Service] = {}
         self.groups: dict[str, list[str]] = {}
+        self._sorted_group_names: list[str] = []
         self.autostart_groups: list[str] = []
+        self._last_config_bytes: bytes | None = None
+        self._row_cache: dict[str, tuple] = {}
+        self._tag_cache: dict[str, str] = {}
+        self._sel_paths: list[str] = []
         self._load_config()
         self._build_ui()
         self._refresh_loop()
@@ -159,7 +238,7 @@ class ServiceAggregator(tk.Tk):
 
         self.group_var = tk.StringVar()
         self.group_combo = ttk.Combobox(group_frame, textvariable=self.group_var, width=28,
-                                        values=sorted(self.groups.keys()), state='readonly')
+                                        values=self._sorted_group_names, state='readonly')
         self.group_combo.pack(side='left', padx=6)
         self.group_combo.bind("<<ComboboxSelected>>", lambda e: self._on_group_selected())
 
@@ -188,6 +267,7 @@ class ServiceAggregator(tk.Tk):
         self.tree.pack(fill="both", expand=True, padx=6, pady=4)
 
         self.tree.bind("<Double-1>", lambda _: self.start_selected())
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
         self.tree.tag_configure('RUNNING', foreground='#4CAF50')
         self.tree.tag_configure('STOPPED', foreground='#b0b0b0')
         self.tree.tag_configure('EXIT', foreground='#ffb347')
@@ -200,22 +280,32 @@ class ServiceAggregator(tk.Tk):
         self.refresh_now()
 
     # ---------- Helpers ----------
+    def _add_service(self, s: Service):
+        self.services.append(s)
+        self._by_path[s.path] = s
+
+    def _remove_service(self, s: Service):
+        self.services = [x for x in self.services if x.path != s.path]
+        self._by_path.pop(s.path, None)
+
     def _find_service_by_path(self, path: str):
-        for s in self.services:
-            if s.path == path: return s
-        return None
+        return self._by_path.get(path)
+
+    def _on_tree_select(self, _event=None):
+        # Cache the selection once per change so every action doesn't
+        # round-trip through Tcl for it.
+        self._sel_paths = list(self.tree.selection())
 
     def _selected_paths(self):
-        sels = self.tree.selection()
-        return list(sels)
+        return self._sel_paths
 
     def get_selected_service(self):
-        paths = self._selected_paths()
-        if not paths: return None
-        return self._find_service_by_path(paths[0])
+        if not self._sel_paths: return None
+        return self._by_path.get(self._sel_paths[0])
 
     # ---------- Actions ----------
     def add_service(self):
+        from tkinter import filedialog, messagebox
         path = filedialog.askopenfilename(
             title="Select Python script or Windows executable",
             filetypes=[("All Files", "*.*")]
@@ -224,24 +314,27 @@ class ServiceAggregator(tk.Tk):
         if self._find_service_by_path(path):
             messagebox.showinfo("Exists", "Already added.")
             return
-        self.services.append(Service(path))
+        self._add_service(Service(path))
         self._save_config(); self.refresh_now()
 
     def remove_selected(self):
+        from tkinter import messagebox
         s = self.get_selected_service()
         if not s: return
         if s.is_running and not messagebox.askyesno("Running", "Service running. Stop first?"):
             return
         s.stop(force=True)
-        self.services = [x for x in self.services if x.path != s.path]
+        s.close_log()
+        self._remove_service(s)
         # remove from groups
         for g in list(self.groups.keys()):
             self.groups[g] = [p for p in self.groups[g] if p != s.path]
-            if not self.groups[g]: del self.groups[g]
+            if not self.groups[g]: self._del_group(g)
         self.autostart_groups = [g for g in self.autostart_groups if g in self.groups]
         self._save_config(); self._refresh_groups_ui(); self.refresh_now()
 
     def start_selected(self):
+        from tkinter import messagebox
         for s in [self._find_service_by_path(p) for p in self._selected_paths()]:
             if not s: continue
             try: s.start()
@@ -254,6 +347,7 @@ class ServiceAggregator(tk.Tk):
         self.refresh_now()
 
     def restart_selected(self):
+        from tkinter import messagebox
         for s in [self._find_service_by_path(p) for p in self._selected_paths()]:
             if not s: continue
             try: s.restart()
@@ -261,18 +355,53 @@ class ServiceAggregator(tk.Tk):
         self.refresh_now()
 
     def start_all(self):
+        # Popen releases the GIL during process creation, so launching in
+        # threads overlaps the per-process spawn cost instead of freezing
+        # the UI for the sum of them.
+        if not self.services: return
+        from tkinter import messagebox
         errs=[]
-        for s in self.services:
-            try: s.start()
-            except Exception as e: errs.append(f"{Path(s.path).name}: {e}")
+        with ThreadPoolExecutor(max_workers=min(16, len(self.services))) as ex:
+            futs = {ex.submit(s.start): s for s in self.services}
+            for f in as_completed(futs):
+                try: f.result()
+                except Exception as e: errs.append(f"{futs[f]._path_obj.name}: {e}")
         if errs: messagebox.showerror("Errors", "\n".join(errs))
         self.refresh_now()
 
+    @staticmethod
+    def _batch_wait(services, timeout: float):
+        # Reap many exits per polling pass instead of serializing one
+        # wait(timeout) per child; returns the services still running.
+        deadline = time.monotonic() + timeout
+        pending = [s for s in services if s.proc is not None]
+        while pending and time.monotonic() < deadline:
+            pending = [s for s in pending if s.proc.poll() is None]
+            if pending: time.sleep(0.05)
+        return pending
+
+    def _stop_services(self, services, timeout=5.0):
+        # Terminate everyone first, reap exits in one batched wait, then
+        # force-kill stragglers: O(timeout) wall time instead of O(N).
+        running = [s for s in services if s.is_running]
+        if not running: return
+        for s in running:
+            try: s.request_stop()
+            except Exception: pass
+        stragglers = self._batch_wait(running, timeout)
+        for s in stragglers:
+            try: s.proc.kill()
+            except Exception: pass
+        self._batch_wait(stragglers, 1.0)
+        for s in running:
+            s._finalize_stop()
+
     def stop_all(self):
-        for s in self.services: s.stop(force=True)
+        self._stop_services(self.services)
         self.refresh_now()
 
     def open_log_selected(self):
+        from tkinter import messagebox
         s = self.get_selected_service()
         if not s: return
         if not s.log_path.exists():
@@ -281,8 +410,21 @@ class ServiceAggregator(tk.Tk):
         else: subprocess.Popen(["xdg-open", str(s.log_path)])
 
     # ---------- Groups ----------
+    def _add_group(self, name: str, paths: list[str]):
+        # Keep the sorted name list incrementally maintained so the combo
+        # isn't re-sorted (and re-assigned) on every UI touch.
+        if name not in self.groups:
+            bisect.insort(self._sorted_group_names, name)
+            self.group_combo['values'] = self._sorted_group_names
+        self.groups[name] = paths
+
+    def _del_group(self, name: str):
+        if name not in self.groups: return
+        del self.groups[name]
+        self._sorted_group_names.remove(name)
+        self.group_combo['values'] = self._sorted_group_names
+
     def _refresh_groups_ui(self):
-        self.group_combo['values'] = sorted(self.groups.keys())
         cur = self.group_var.get()
         if cur not in self.groups:
             self.group_var.set('')
@@ -295,22 +437,24 @@ class ServiceAggregator(tk.Tk):
         self.autostart_var.set(g in self.autostart_groups)
 
     def save_selection_as_group(self):
+        from tkinter import messagebox, simpledialog
         sel_paths = self._selected_paths()
         if not sel_paths:
             messagebox.showinfo("No selection", "Select one or more services first.")
             return
         name = simpledialog.askstring("Group Name", "Enter group name:")
         if not name: return
-        self.groups[name] = sel_paths
+        self._add_group(name, sel_paths)
         self._save_config(); self._refresh_groups_ui()
         self.group_var.set(name)
         self.autostart_var.set(name in self.autostart_groups)
 
     def delete_group(self):
+        from tkinter import messagebox
         g = self.group_var.get()
         if not g: return
         if not messagebox.askyesno("Delete Group", f"Delete group '{g}'?"): return
-        if g in self.groups: del self.groups[g]
+        self._del_group(g)
         self.autostart_groups = [x for x in self.autostart_groups if x != g]
         self._save_config(); self._refresh_groups_ui()
 
@@ -344,32 +488,73 @@ class ServiceAggregator(tk.Tk):
 
     # ---------- Refresh ----------
     def refresh_now(self):
+        self._rebuild_rows()
+
+    @staticmethod
+    def _classify(s: Service, exists: bool):
+        # One pass over the state checks, yielding the status cell and its
+        # row tag together.
+        if not exists: return "MISSING", "MISSING"
+        if s.is_running: return "RUNNING", "RUNNING"
+        if s.last_returncode is not None: return f"EXIT({s.last_returncode})", "EXIT"
+        return "STOPPED", "STOPPED"
+
+    def _rebuild_rows(self):
         existing_iids = set(self.tree.get_children())
         wanted_iids = set(s.path for s in self.services)
         for iid in existing_iids - wanted_iids:
             self.tree.delete(iid)
+            self._row_cache.pop(iid, None)
+            self._tag_cache.pop(iid, None)
         for idx, s in enumerate(self.services):
-            if s.is_running: status = "RUNNING"
-            elif s.last_returncode is not None: status = f"EXIT({s.last_returncode})"
-            else: status = "STOPPED"
-            if not Path(s.path).exists(): status = "MISSING"
-            uptime=""
-            if s.is_running and s.start_time:
-                diff=int(time.time()-s.start_time); m, sec=divmod(diff,60); h,m=divmod(m,60)
-                uptime=f"{h:02d}:{m:02d}:{sec:02d}"
-            row=(status, s.pid, uptime, s.mtime, s.path)
-            tag = ('RUNNING' if status=="RUNNING"
-                   else 'MISSING' if status=="MISSING"
-                   else 'EXIT' if status.startswith("EXIT") else 'STOPPED')
+            exists, mtime_str = s._stat_once()
+            status, tag = self._classify(s, exists)
+            row=(status, s.pid, s.uptime_str(time.monotonic()), mtime_str, s.path)
+            s._last_seen_running = s.is_running
             if s.path in existing_iids:
-                self.tree.item(s.path, values=row, tags=(tag,))
+                # Push only changed cells through the Tcl bridge; a full
+                # item(values=...) marshals all five columns every time.
+                old = self._row_cache.get(s.path)
+                if old is None:
+                    self.tree.item(s.path, values=row)
+                elif old != row:
+                    for i, val in enumerate(row):
+                        if old[i] != val:
+                            self.tree.set(s.path, self.COLUMNS[i], val)
+                if self._tag_cache.get(s.path) != tag:
+                    self.tree.item(s.path, tags=(tag,))
             else:
                 self.tree.insert("", "end", iid=s.path, values=row, tags=(tag,))
+            self._row_cache[s.path] = row
+            self._tag_cache[s.path] = tag
         self.status_bar.config(text=f"Services: {len(self.services)}  |  Groups: {len(self.groups)}")
 
+    def _tick_uptime(self):
+        # Cheap 1 Hz update: only the uptime column of running rows. A full
+        # structural rebuild happens on mutations, or here when a service
+        # changed state on its own (e.g. the process exited).
+        if any(s.is_running != s._last_seen_running for s in self.services):
+            self._rebuild_rows()
+            return
+        now = time.monotonic()
+        for s in self.services:
+            if not (s.is_running and s.start_time): continue
+            uptime = s.uptime_str(now)
+            old = self._row_cache.get(s.path)
+            if old is not None and old[2] == uptime: continue
+            self.tree.set(s.path, "uptime", uptime)
+            if old is not None:
+                self._row_cache[s.path] = old[:2] + (uptime,) + old[3:]
+
     def _refresh_loop(self):
-        if self.auto_refresh_var.get(): self.refresh_now()
-        self.after(2000, self._refresh_loop)
+        # Nobody can see the rows while iconified/unmapped: skip the tick
+        # and poll again at a much slower cadence.
+        if not self.winfo_viewable() or self.state() == 'iconic':
+            self.after(5000, self._refresh_loop)
+            return
+        if self.auto_refresh_var.get():
+            self._tick_uptime()
+        self.after(1000, self._refresh_loop)
 
     # ---------- Persistence ----------
     def _load_config(self):
@@ -380,21 +565,26 @@ class ServiceAggregator(tk.Tk):
                     "services": [],
                     "groups": {},
                     "autostart_groups": []
-                }, indent=2), encoding="utf-8")
+                }, separators=(",", ":")), encoding="utf-8")
             except Exception as e:
                 print(f"[Config Create Error] {e}")
 
         if CONFIG_FILE.exists():
             try:
-                data = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+                raw = CONFIG_FILE.read_bytes()
+                data = json.loads(raw)
+                self._last_config_bytes = raw
                 for p in data.get("services", []):
-                    if p and isinstance(p, str): self.services.append(Service(p))
+                    if p and isinstance(p, str): self._add_service(Service(p))
                 self.groups = data.get("groups", {}) or {}
+                self._sorted_group_names = sorted(self.groups)
                 self.autostart_groups = data.get("autostart_groups", []) or []
             except Exception:
                 # If loading fails, fall back to empty defaults
                 self.services = []
+                self._by_path = {}
                 self.groups = {}
+                self._sorted_group_names = []
                 self.autostart_groups = []
 
     def _save_config(self):
@@ -403,26 +593,48 @@ class ServiceAggregator(tk.Tk):
             "groups": self.groups,
             "autostart_groups": self.autostart_groups
         }
+        new = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        if new == self._last_config_bytes:
+            return  # nothing changed on disk; skip the rewrite
         try:
-            CONFIG_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            # Write to a sibling temp file and rename into place so a crash
+            # mid-write can't leave a truncated config behind.
+            tmp = CONFIG_FILE.with_suffix(".json.tmp")
+            tmp.write_bytes(new)
+            os.replace(tmp, CONFIG_FILE)
+            self._last_config_bytes = new
         except Exception as e:
+            from tkinter import messagebox
             messagebox.showerror("Save Error", str(e))
 
     # ---------- Close ----------
     def on_close(self):
-        # Graceful stop all (non-force), then force remaining
+        # Graceful stop all (non-force), then let the event loop poll for
+        # exits; force-kill whatever is left once the deadline passes.
         self.status_bar.config(text="Stopping services...")
-        self.update_idletasks()
         for s in self.services:
-            try: s.stop(force=False)
+            try: s.request_stop()
             except Exception: pass
-        deadline = time.time() + 4
-        while any(s.is_running for s in self.services) and time.time() < deadline:
-            time.sleep(0.3); self.refresh_now(); self.update()
-        for s in self.services:
-            if s.is_running:
-                try: s.stop(force=True)
+        self._shutdown_deadline = time.monotonic() + 4
+        self.after(0, self._shutdown_tick)
+
+    def _shutdown_tick(self):
+        still = [s for s in self.services if s.is_running]
+        if not still:
+            self._finalize_close(); return
+        if time.monotonic() >= self._shutdown_deadline:
+            for s in still:
+                try: s.proc.kill()
                 except Exception: pass
+            self._batch_wait(still, 1.0)
+            self._finalize_close(); return
+        self.status_bar.config(text=f"Stopping services... ({len(still)} still running)")
+        self.after(200, self._shutdown_tick)
+
+    def _finalize_close(self):
+        for s in self.services:
+            s._finalize_stop()
+            s.close_log()
         self.destroy()
 
 if __name__ == "__main__":